@@ -0,0 +1,26 @@
+"""
+Gunicorn settings for the Go-Kart Announcement System web interface.
+
+Run with: gunicorn -c gunicorn_conf.py settings:app
+
+A single worker process is used on purpose: the announcement cooldown, the in-process
+playing flag and the background TTS event loop live in the settings module, so extra
+worker processes would each keep their own copy. Threads provide the concurrency instead,
+which also keeps long-lived status streams from blocking other requests.
+"""
+
+bind = "0.0.0.0:5000"
+workers = 1
+worker_class = "gthread"
+threads = 8
+# The app is not preloaded: settings starts its TTS and pre-generation threads at import,
+# and threads do not survive the fork into a worker.
+preload_app = False
+
+
+def post_worker_init(worker):
+    """
+    Run the same startup work as the development server once the worker has imported the app.
+    """
+    import settings
+    settings.startup()
@@ -8,141 +8,352 @@ The script uses a rotating log to ensure log file sizes remain bounded.
 """
 
 import asyncio
+import atexit
+import configparser
 import edge_tts
 import logging
 import sys
 import os
+import shutil
 import subprocess
 import time
 import hashlib
+import queue
 import threading
+import wave
+from array import array
+from dataclasses import dataclass, field
 from pathlib import Path
-from logging.handlers import RotatingFileHandler  # Import rotating logs handler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler  # Import rotating logs handler
 
-# Configure rotating logging
-rotating_handler = RotatingFileHandler("announcement_script.log", maxBytes=5000000, backupCount=2)
-rotating_handler.setLevel(logging.DEBUG)
+try:
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None
+
+try:
+    import alsaaudio
+except ImportError:
+    alsaaudio = None
+
+try:
+    import gpiod
+    from gpiod.line import Bias, Direction, Edge, Value
+except ImportError:
+    gpiod = None
+
+
+class FastRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that skips the per-record exists/isfile stat calls made by newer Python
+    versions; the log path is always a regular file here, so only the size check is needed.
+    """
+    def shouldRollover(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes > 0:
+            msg = "%s\n" % self.format(record)
+            self.stream.seek(0, 2)
+            if self.stream.tell() + len(msg) >= self.maxBytes:
+                return True
+        return False
+
+
+# Configure rotating logging. Log calls only enqueue records; a listener thread does the
+# file and console writes so the press path never waits on the SD card.
+rotating_handler = FastRotatingFileHandler("announcement_script.log", maxBytes=5000000, backupCount=2)
+rotating_handler.setLevel(logging.INFO)
 rotating_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S"))
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, rotating_handler, logging.StreamHandler(sys.stdout), respect_handler_level=True)
 logging.basicConfig(
-    level=logging.DEBUG,
-    handlers=[rotating_handler, logging.StreamHandler(sys.stdout)]
+    level=logging.INFO,
+    handlers=[QueueHandler(log_queue)]
 )
 
-# Path to a lock file used to indicate an announcement is playing
+# Path to a lock file used to indicate an announcement is playing.
+# The web service checks it too, so it is kept alongside the in-process flag below.
 ANNOUNCEMENT_LOCK_FILE = "/tmp/announcement_playing.lock"
 
+# In-process flag set while this service is playing an announcement
+announcement_playing = threading.Event()
+
 # Directory where TTS audio files are cached
 CACHE_DIR = "/tmp/tts_cache"
 os.makedirs(CACHE_DIR, exist_ok=True)
 
-# Dictionary to track the last announcement time for each button
-last_button_press = {
-    "button1": 0,
-    "button2": 0,
-    "button3": 0,
-    "button4": 0   # Button 4 plays the pre-existing Yiddish announcement
-}
+# Maximum number of TTS syntheses in flight at once during pre-generation
+TTS_MAX_CONCURRENCY = 3
+
+# Upper bound on decoded PCM kept in memory across all buttons
+PCM_MEMORY_LIMIT = 4 * 1024 * 1024
+
+# TTS engine version, folded into the cache key so an edge-tts upgrade regenerates cached audio
+TTS_ENGINE_TAG = f"edge-tts/{getattr(edge_tts, '__version__', 'unknown')}".encode()[:16]
+
+# Upper bound on the TTS cache size; older files beyond it are evicted
+CACHE_MAX_BYTES = 10 * 1024 * 1024
+
+# Seconds a streamed cache-miss synthesis waits for the next chunk before giving up
+TTS_REQUEST_TIMEOUT = 30.0
+
+# Age in seconds after which a .partial file in the cache is taken to be left over from a killed process
+PARTIAL_MAX_AGE = 600
+
+# Pre-recorded announcement played by button 4
+YIDDISH_FILE = "/home/tech/yiddish.mp3"
+
+# Resolve the mpg123 binary once instead of probing for it on every playback
+MPG123 = shutil.which("mpg123")
+
+# Persistent mpg123 player, started in main() once mpg123 is known to be installed
+audio_player = None
+
+# Button identifiers in index order; the hot path refers to buttons by their position here
+BUTTON_IDS = ("button1", "button2", "button3", "button4")
+
+# Last announcement time (time.monotonic) for each button, indexed like BUTTON_IDS
+# (button 4 plays the pre-existing Yiddish announcement)
+last_button_press = array('d', [float('-inf')] * len(BUTTON_IDS))
+
+# Long-lived event loop for TTS synthesis, so presses don't pay for a new loop each time
+tts_loop = asyncio.new_event_loop()
+threading.Thread(target=tts_loop.run_forever, name="tts-loop", daemon=True).start()
 
 # Minimum time between announcements for the same button (in seconds)
 DEBOUNCE_TIMEOUT = 8.0
 
-# Threading lock to ensure only one button press is processed at a time
-button_handler_lock = threading.Lock()
+# SCHED_FIFO priority for the press worker thread, applied only when the service has CAP_SYS_NICE
+WORKER_RT_PRIORITY = 10
+
+# Seconds between config file checks when inotify is not available
+CONFIG_POLL_INTERVAL = 10
+
+# GPIO character device used when the gpiod backend is available
+GPIO_CHIP = "/dev/gpiochip0"
+
+# Minimum time between edges on the same line for the gpiod backend (matches RPi.GPIO bouncetime)
+GPIO_BOUNCE_NS = 500_000_000
 
+# Active gpiod line request, replaced whenever GPIO is set up again
+gpio_request = None
 
+# Presses are handed to a single worker thread, which also ensures only one is processed at a time
+press_queue = queue.Queue(maxsize=4)
+
+# Config used for button presses; swapped in place on reload so GPIO callbacks never go stale
+current_config = None
+
+
+@dataclass(slots=True)
 class Config:
     """
     Configuration object to hold announcement texts, TTS settings, and GPIO assignments.
     """
-    def __init__(self):
-        self.announcements = {
-            "button1": "",
-            "button2": "",
-            "button3": "",
-            "button4": ""
-        }
-        self.tts = {
-            "voice_id": "",
-            "output_format": "mp3"
-        }
-        self.gpio = {
-            "button1": 17,
-            "button2": 27,
-            "button3": 22,
-            "button4": 23
-        }
-        self.last_modified = 0
+    announcements: dict = field(default_factory=lambda: {
+        "button1": "",
+        "button2": "",
+        "button3": "",
+        "button4": ""
+    })
+    tts: dict = field(default_factory=lambda: {
+        "voice_id": "",
+        "output_format": "mp3"
+    })
+    gpio: dict = field(default_factory=lambda: {
+        "button1": 17,
+        "button2": 27,
+        "button3": 22,
+        "button4": 23
+    })
+    # Cache file paths keyed by button, resolved once when the config is loaded
+    cache_files: dict = field(default_factory=dict)
+    # Audio bytes keyed by button, loaded after pre-generation so playback skips the file read
+    audio_blobs: dict = field(default_factory=dict)
+    # Decoded PCM keyed by button, kept in memory when direct ALSA playback is available
+    pcm_clips: dict = field(default_factory=dict)
+    # Flattened per-button view built by load_config for the button-press path
+    resolved: "ResolvedConfig" = None
+    last_modified_ns: int = 0
+    # BLAKE2b digest of the raw config file, used to skip reloads when only the mtime changed
+    content_hash: bytes = b""
+
+
+@dataclass(slots=True, frozen=True)
+class ResolvedConfig:
+    """
+    Per-button settings flattened into tuples indexed like BUTTON_IDS, so a press needs no dict lookups.
+    """
+    voice_id: str
+    output_format: str
+    announcements: tuple
+    cache_paths: tuple
+
+
+def resolve_config(config: Config) -> ResolvedConfig:
+    """
+    Build the ResolvedConfig view of a loaded Config.
+    """
+    return ResolvedConfig(
+        voice_id=config.tts['voice_id'],
+        output_format=config.tts['output_format'],
+        announcements=tuple(config.announcements.get(button_id, "") for button_id in BUTTON_IDS),
+        cache_paths=tuple(config.cache_files.get(button_id, "") for button_id in BUTTON_IDS)
+    )
 
 
 def is_announcement_playing():
     """
-    Check if an announcement is currently playing by verifying the lock file's existence.
+    Check if an announcement is currently playing.
+    The in-process flag is checked first; the lock file is only consulted for playback started by the web service.
     """
-    return os.path.exists(ANNOUNCEMENT_LOCK_FILE)
+    return announcement_playing.is_set() or os.path.exists(ANNOUNCEMENT_LOCK_FILE)
 
 
-def set_announcement_playing(is_playing=True):
+def release_announcement_lock():
     """
-    Create or remove the lock file based on the announcement playing status.
+    Clear the in-process flag and remove the lock file claimed by try_acquire_announcement_lock.
     """
-    if is_playing:
-        with open(ANNOUNCEMENT_LOCK_FILE, 'w') as f:
-            f.write(str(time.time()))
-    else:
-        if os.path.exists(ANNOUNCEMENT_LOCK_FILE):
-            try:
-                os.remove(ANNOUNCEMENT_LOCK_FILE)
-            except Exception as e:
-                logging.warning(f"Failed to remove lock file: {e}")
+    announcement_playing.clear()
+    try:
+        os.remove(ANNOUNCEMENT_LOCK_FILE)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.warning(f"Failed to remove lock file: {e}")
+
+
+def try_acquire_announcement_lock() -> bool:
+    """
+    Atomically claim the announcement lock file with O_EXCL.
+    Returns False if this service or the web service is already playing an announcement.
+    """
+    if announcement_playing.is_set():
+        return False
+    try:
+        fd = os.open(ANNOUNCEMENT_LOCK_FILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+    except FileExistsError:
+        return False
+    try:
+        os.write(fd, str(time.time()).encode())
+    finally:
+        os.close(fd)
+    announcement_playing.set()
+    return True
+
+
+def normalize_text_bytes(text_bytes: bytes) -> bytes:
+    """
+    Trim UTF-8 announcement text and collapse runs of whitespace to single spaces, so edits that
+    only change spacing or line breaks share a cache entry. Must match settings.py.
+    """
+    return b' '.join(text_bytes.split())
 
 
 def get_cache_filename(text: str, voice_id: str):
     """
     Generate a unique filename for caching synthesized speech based on text and voice ID.
+    Called once per announcement when the config is loaded; presses use the resolved paths.
+    """
+    # Keying the hash by voice ID keeps (text, voice_id) pairs distinct without a separator;
+    # the personalization string ties the entry to the TTS engine version.
+    hash_object = hashlib.blake2b(
+        normalize_text_bytes(text.encode()), key=voice_id.encode()[:64], person=TTS_ENGINE_TAG, digest_size=16
+    )
+    return os.path.join(CACHE_DIR, f"{hash_object.hexdigest()}.mp3")
+
+
+def remove_file(path: str):
+    """
+    Remove a file with a single unlink, ignoring it if it is already gone.
     """
-    hash_object = hashlib.md5((text + voice_id).encode())
-    hash_str = hash_object.hexdigest()
-    return os.path.join(CACHE_DIR, f"{hash_str}.mp3")
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logging.warning(f"Failed to remove {path}: {e}")
+
+
+def is_cached_file_ready(path: str) -> bool:
+    """
+    Check that an audio file exists and is non-empty using a single stat call.
+    """
+    try:
+        return os.stat(path).st_size > 0
+    except OSError:
+        return False
 
 
-def load_config(config_path: str = "config.ini") -> Config:
+def has_mp3_header(path: str) -> bool:
+    """
+    Check that a cached file starts like an MP3: an ID3 tag or an MPEG frame sync word.
+    Used at pre-generation time to catch truncated or corrupt cache entries.
+    """
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(3)
+    except OSError:
+        return False
+    return head == b"ID3" or (len(head) >= 2 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0)
+
+
+def hash_config_data(data: bytes) -> bytes:
+    """
+    Digest the raw config file contents for change detection.
+    """
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def read_config_file(config_path: str) -> tuple:
+    """
+    Read the config file with a single open and fstat, returning (mtime_ns, contents).
+    """
+    with open(config_path, 'rb') as f:
+        return os.fstat(f.fileno()).st_mtime_ns, f.read()
+
+
+def load_config(config_path: str = "config.ini", snapshot: tuple = None) -> Config:
     """
     Load the configuration from the config file.
+    A (mtime_ns, contents) snapshot already read by the caller is parsed instead of reading the file again.
     """
     config = Config()
-    current_section = None
     try:
-        if not os.path.exists(config_path):
+        try:
+            if snapshot is None:
+                snapshot = read_config_file(config_path)
+        except FileNotFoundError:
             logging.error(f"Config file not found: {config_path}")
             raise FileNotFoundError(f"Config file not found: {config_path}")
-        config.last_modified = os.path.getmtime(config_path)
-        with open(config_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                if line.startswith('[') and line.endswith(']'):
-                    current_section = line[1:-1].lower()
-                    continue
-                if '=' not in line:
-                    continue
-                key, value = [x.strip() for x in line.split('=', 1)]
+        config.last_modified_ns, data = snapshot
+        config.content_hash = hash_config_data(data)
+        # RawConfigParser never interpolates, so announcement text may contain '%' characters.
+        parser = configparser.RawConfigParser(strict=False, delimiters=('=',))
+        parser.read_string(data.decode(), source=config_path)
+        for section in parser.sections():
+            current_section = section.lower()
+            for key, value in parser.items(section):
                 clean_value = value.strip('"\'')
                 if current_section == 'announcements':
-                    if key.lower() in config.announcements:
-                        config.announcements[key.lower()] = clean_value
+                    if key in config.announcements:
+                        config.announcements[key] = clean_value
                 elif current_section == 'tts':
-                    if key.lower() == 'voice_id':
+                    if key == 'voice_id':
                         config.tts['voice_id'] = clean_value
-                    elif key.lower() == 'output_format':
+                    elif key == 'output_format':
                         config.tts['output_format'] = clean_value.lower()
                 elif current_section == 'gpio':
                     try:
-                        config.gpio[key.lower()] = int(clean_value)
+                        config.gpio[key] = int(clean_value)
                     except ValueError:
                         logging.warning(f"Invalid GPIO pin value for {key}: {clean_value}")
         if not config.tts['voice_id']:
             raise ValueError("Missing required TTS voice_id configuration")
+        for button_id, text in config.announcements.items():
+            if text:
+                config.cache_files[button_id] = get_cache_filename(text, config.tts['voice_id'])
+        config.resolved = resolve_config(config)
         logging.info("Configuration loaded successfully")
         return config
     except Exception as e:
@@ -153,12 +364,15 @@ def load_config(config_path: str = "config.ini") -> Config:
 async def synthesize_speech_async(text: str, voice_id: str, output_path: str) -> bool:
     """
     Asynchronously synthesize speech using edge_tts.
+    Audio is written to a partial file and renamed into place so a cache hit never sees a truncated file.
     """
+    partial_path = f"{output_path}.{os.getpid()}.partial"
     try:
         logging.info(f"Synthesizing speech: {text[:50]}...")
         communicate = edge_tts.Communicate(text, voice_id)
-        await communicate.save(output_path)
-        if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+        await communicate.save(partial_path)
+        if is_cached_file_ready(partial_path):
+            os.replace(partial_path, output_path)
             logging.info("Speech synthesis successful")
             return True
         else:
@@ -167,21 +381,281 @@ async def synthesize_speech_async(text: str, voice_id: str, output_path: str) ->
     except Exception as e:
         logging.error(f"Error during speech synthesis: {e}")
         return False
+    finally:
+        remove_file(partial_path)
+
+
+async def stream_and_cache_async(text: str, voice_id: str, output_path: str) -> bool:
+    """
+    Synthesize speech and play it as the audio arrives, writing the same bytes to the cache.
+    Used on a cache miss so playback does not wait for the whole file to be synthesized.
+    Gives up if the TTS service sends nothing for TTS_REQUEST_TIMEOUT seconds, so a stalled
+    stream cannot hold the press worker and the announcement lock indefinitely.
+    """
+    partial_path = f"{output_path}.{os.getpid()}.stream.partial"
+    player = None
+    stream = None
+    player_failed = False
+    try:
+        logging.info(f"Streaming speech: {text[:50]}...")
+        player = await asyncio.create_subprocess_exec(MPG123, '-q', '-', stdin=subprocess.PIPE)
+        communicate = edge_tts.Communicate(text, voice_id)
+        stream = communicate.stream()
+        with open(partial_path, 'wb') as f:
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(anext(stream), TTS_REQUEST_TIMEOUT)
+                except StopAsyncIteration:
+                    break
+                if chunk["type"] != "audio":
+                    continue
+                f.write(chunk["data"])
+                if not player_failed:
+                    try:
+                        player.stdin.write(chunk["data"])
+                        await player.stdin.drain()
+                    except (BrokenPipeError, ConnectionResetError):
+                        # Keep caching the rest of the speech so the next press can play it
+                        logging.warning("mpg123 exited during streamed playback, caching the rest unplayed")
+                        player_failed = True
+        player.stdin.close()
+        returncode = await player.wait()
+        if is_cached_file_ready(partial_path):
+            os.replace(partial_path, output_path)
+            logging.info("Speech synthesis successful")
+        else:
+            logging.error("Speech synthesis failed - output file empty or missing")
+            return False
+        return returncode == 0 and not player_failed
+    except Exception as e:
+        logging.error(f"Error during streamed speech synthesis: {e!r}")
+        if player is not None and player.returncode is None:
+            player.kill()
+            await player.wait()
+        return False
+    finally:
+        if stream is not None:
+            await stream.aclose()
+        remove_file(partial_path)
+
+
+async def warm_up_tts_async(voice_id: str):
+    """
+    Run one throwaway synthesis so DNS lookups and library setup are done before the first
+    uncached press. The audio is discarded.
+    """
+    try:
+        communicate = edge_tts.Communicate(".", voice_id)
+        async for _ in communicate.stream():
+            pass
+        logging.info("TTS connection warmed up")
+    except Exception as e:
+        logging.debug("TTS warm-up failed: %s", e)
+
+
+async def synthesize_and_decode_async(text: str, voice_id: str, output_path: str) -> bool:
+    """
+    Synthesize speech, then decode it to PCM on a worker thread when direct ALSA playback is
+    available, so the decode overlaps with any other synthesis still waiting on the network.
+    """
+    if not await synthesize_speech_async(text, voice_id, output_path):
+        return False
+    if alsaaudio is not None and MPG123 is not None:
+        await asyncio.get_running_loop().run_in_executor(None, decode_to_pcm, output_path)
+    return True
 
 
-def play_sound(sound_path: str, output_format: str) -> bool:
+async def synthesize_batch_async(jobs) -> list:
     """
-    Play the specified audio file using mpg123.
+    Synthesize several (text, voice_id, output_path) jobs concurrently, decoding each one
+    as soon as its own synthesis finishes. At most TTS_MAX_CONCURRENCY syntheses run at once.
     """
-    if not sound_path or not os.path.exists(sound_path):
+    semaphore = asyncio.Semaphore(TTS_MAX_CONCURRENCY)
+
+    async def run_job(job):
+        async with semaphore:
+            return await synthesize_and_decode_async(*job)
+    return await asyncio.gather(*(run_job(job) for job in jobs))
+
+
+def run_tts(coro):
+    """
+    Run a coroutine on the shared TTS event loop and block until it completes.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, tts_loop).result()
+
+
+class RemotePlayer:
+    """
+    Long-running mpg123 process in remote-control mode (-R), reused across announcements
+    so each press skips process startup and audio device initialisation.
+    """
+    def __init__(self, binary: str):
+        self.binary = binary
+        self.process = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        """
+        Launch the mpg123 remote-control process and silence per-frame progress reports.
+        """
+        self.process = subprocess.Popen(
+            [self.binary, '-R'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        self.send("SILENCE")
+        logging.info("Started persistent mpg123 player")
+
+    def send(self, command: str):
+        """
+        Write a single remote-control command to mpg123.
+        """
+        self.process.stdin.write(command + "\n")
+        self.process.stdin.flush()
+
+    def play(self, sound_path: str) -> bool:
+        """
+        Play a file and block until mpg123 reports that playback stopped.
+        """
+        with self.lock:
+            try:
+                if self.process is None or self.process.poll() is not None:
+                    self.start()
+                self.send(f"LOAD {sound_path}")
+                for line in self.process.stdout:
+                    if line.startswith("@P 0"):
+                        return True
+                    if line.startswith("@E"):
+                        logging.error(f"mpg123 error: {line[2:].strip()}")
+                        break
+            except (OSError, ValueError) as e:
+                logging.error(f"Persistent mpg123 player failed: {e}")
+            # Restart on the next play so unread status lines can't be mistaken for a later result
+            self.stop()
+            return False
+
+    def stop(self):
+        """
+        Terminate the mpg123 process if it is running.
+        """
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+        self.process = None
+
+
+def get_pcm_filename(sound_path: str) -> str:
+    """
+    Return the path of the decoded WAV copy of an MP3, kept alongside the TTS cache.
+    """
+    name = os.path.splitext(os.path.basename(sound_path))[0]
+    return os.path.join(CACHE_DIR, f"{name}.wav")
+
+
+def decode_to_pcm(sound_path: str) -> bool:
+    """
+    Decode an MP3 to 16-bit PCM WAV once so playback can skip MP3 decoding.
+    An existing WAV is reused unless the MP3 is newer.
+    """
+    pcm_path = get_pcm_filename(sound_path)
+    try:
+        pcm_stat = os.stat(pcm_path)
+        if pcm_stat.st_size > 0 and pcm_stat.st_mtime_ns >= os.stat(sound_path).st_mtime_ns:
+            return True
+    except OSError:
+        pass
+    partial_path = f"{pcm_path}.{os.getpid()}.partial"
+    try:
+        subprocess.run([MPG123, '-q', '-w', partial_path, sound_path], check=True)
+        os.replace(partial_path, pcm_path)
+        return True
+    except Exception as e:
+        logging.warning(f"Failed to decode {sound_path} to PCM: {e}")
+        remove_file(partial_path)
+        return False
+
+
+@dataclass(slots=True, frozen=True)
+class PcmClip:
+    """
+    Decoded 16-bit PCM audio held in memory for direct ALSA playback.
+    """
+    channels: int
+    rate: int
+    frames: bytes
+
+
+def read_pcm_clip(pcm_path: str):
+    """
+    Read a decoded WAV file into a PcmClip, or return None if it is not 16-bit PCM.
+    """
+    with wave.open(pcm_path, 'rb') as wav:
+        if wav.getsampwidth() != 2:
+            return None
+        return PcmClip(wav.getnchannels(), wav.getframerate(), wav.readframes(wav.getnframes()))
+
+
+def play_pcm(clip: PcmClip) -> bool:
+    """
+    Write decoded PCM straight to the ALSA playback device.
+    The device is opened per announcement so it is not held away from the web service's player.
+    """
+    device = alsaaudio.PCM(
+        alsaaudio.PCM_PLAYBACK,
+        channels=clip.channels,
+        rate=clip.rate,
+        format=alsaaudio.PCM_FORMAT_S16_LE,
+        periodsize=1024
+    )
+    try:
+        frames = memoryview(clip.frames)
+        period_bytes = 1024 * clip.channels * 2
+        for offset in range(0, len(frames), period_bytes):
+            device.write(frames[offset:offset + period_bytes])
+        if hasattr(device, 'drain'):
+            device.drain()
+    finally:
+        device.close()
+    return True
+
+
+def play_sound(sound_path: str, output_format: str, audio_data: bytes = None, pcm_clip: PcmClip = None) -> bool:
+    """
+    Play the specified audio file.
+    Decoded PCM, from memory or the WAV cache, is written directly to ALSA when pyalsaaudio is installed. Otherwise the
+    persistent mpg123 player is used, and failing that a one-shot mpg123 fed from memory on stdin
+    when the file's bytes are already loaded.
+    """
+    if audio_data is None and (not sound_path or not os.path.exists(sound_path)):
         logging.error(f"Invalid sound path: {sound_path}")
         return False
     try:
         logging.info(f"Playing sound file: {sound_path}")
-        if subprocess.run(['which', 'mpg123'], capture_output=True).returncode != 0:
+        if alsaaudio is not None and sound_path:
+            pcm_path = get_pcm_filename(sound_path)
+            if pcm_clip is not None or is_cached_file_ready(pcm_path):
+                try:
+                    clip = pcm_clip if pcm_clip is not None else read_pcm_clip(pcm_path)
+                    if clip is not None and play_pcm(clip):
+                        logging.info("Sound played successfully")
+                        return True
+                except Exception as e:
+                    logging.warning(f"PCM playback failed, falling back to mpg123: {e}")
+        if MPG123 is None:
             logging.error("mpg123 is not installed")
             return False
-        subprocess.run(['mpg123', '-q', sound_path], check=True)
+        if audio_player is not None and sound_path and os.path.exists(sound_path):
+            if audio_player.play(sound_path):
+                logging.info("Sound played successfully")
+                return True
+            logging.warning("Persistent player failed, falling back to a one-shot mpg123")
+        if audio_data is not None:
+            subprocess.run([MPG123, '-q', '-'], input=audio_data, check=True)
+        else:
+            subprocess.run([MPG123, '-q', sound_path], check=True)
         logging.info("Sound played successfully")
         return True
     except subprocess.CalledProcessError as e:
@@ -190,81 +664,197 @@ def play_sound(sound_path: str, output_format: str) -> bool:
     except Exception as e:
         logging.error(f"Error playing sound: {e}")
         return False
-    finally:
-        set_announcement_playing(False)
 
 
-def handle_button_press(button_id: str, config: Config):
+def handle_button_press(button_index: int, config: Config):
     """
     Process a button press and play the corresponding announcement.
     """
-    global last_button_press
-    with button_handler_lock:
-        if is_announcement_playing():
-            logging.info(f"Button {button_id} press ignored - announcement already playing")
-            return
-        current_time = time.time()
-        if current_time - last_button_press.get(button_id, 0) < DEBOUNCE_TIMEOUT:
-            logging.info(f"Button {button_id} press ignored - too soon after previous press")
-            return
-        set_announcement_playing(True)
+    button_id = BUTTON_IDS[button_index]
+    resolved = config.resolved
+    current_time = time.monotonic()
+    if current_time - last_button_press[button_index] < DEBOUNCE_TIMEOUT:
+        logging.info("Button %s press ignored - too soon after previous press", button_id)
+        return
+    if not try_acquire_announcement_lock():
+        logging.info("Button %s press ignored - announcement already playing", button_id)
+        return
+    # The lock is released exactly once, here, whichever way the press ends.
+    try:
+        last_button_press[button_index] = current_time
         if button_id == "button4":
             logging.info("Button 4 pressed. Playing Yiddish announcement.")
-            last_button_press[button_id] = current_time
-            if not play_sound("/home/tech/yiddish.mp3", "mp3"):
+            if not play_sound(YIDDISH_FILE, "mp3", config.audio_blobs.get(button_id), config.pcm_clips.get(button_id)):
                 logging.error("Failed to play Yiddish announcement for button4")
-            set_announcement_playing(False)
             return
-        last_button_press[button_id] = current_time
-        announcement_text = config.announcements.get(button_id, "")
+        announcement_text = resolved.announcements[button_index]
         if not announcement_text:
-            logging.error(f"No announcement configured for {button_id}")
-            set_announcement_playing(False)
+            logging.error("No announcement configured for %s", button_id)
             return
-        cache_file = get_cache_filename(announcement_text, config.tts['voice_id'])
-        if not os.path.exists(cache_file) or os.path.getsize(cache_file) == 0:
-            logging.info(f"Cache miss - generating new speech file for button {button_id}")
-            success = asyncio.run(synthesize_speech_async(announcement_text, config.tts['voice_id'], cache_file))
-            if not success:
-                if os.path.exists(cache_file):
-                    os.remove(cache_file)
-                logging.error(f"Failed to synthesize speech for button {button_id}")
-                set_announcement_playing(False)
-                return
-        logging.info(f"Button {button_id} pressed. Playing announcement.")
-        if not play_sound(cache_file, config.tts['output_format']):
-            logging.error(f"Failed to play announcement for {button_id}")
-            set_announcement_playing(False)
-
-
-def make_callback(button_id: str, config: Config):
+        cache_file = resolved.cache_paths[button_index]
+        # Audio loaded into memory at startup or reload doubles as the manifest of ready cache files,
+        # so the common press needs no stat call.
+        if button_id not in config.audio_blobs and not is_cached_file_ready(cache_file):
+            logging.info("Cache miss - streaming new speech file for button %s", button_id)
+            if not run_tts(stream_and_cache_async(announcement_text, resolved.voice_id, cache_file)):
+                logging.error("Failed to stream announcement for %s", button_id)
+            return
+        logging.info("Button %s pressed. Playing announcement.", button_id)
+        if not play_sound(cache_file, resolved.output_format, config.audio_blobs.get(button_id),
+                          config.pcm_clips.get(button_id)):
+            logging.error("Failed to play announcement for %s", button_id)
+    finally:
+        release_announcement_lock()
+
+
+def make_callback(button_id: str):
     """
     Create a GPIO callback function for a specific button.
     """
+    button_index = BUTTON_IDS.index(button_id)
+
     def callback(channel):
-        logging.debug(f"GPIO event detected for button {button_id}")
-        time.sleep(0.005)
-        if GPIO.input(config.gpio[button_id]) == GPIO.LOW:
-            if not is_announcement_playing():
-                threading.Thread(target=handle_button_press, args=(button_id, config), daemon=True).start()
-            else:
-                logging.info(f"Button {button_id} press ignored because an announcement is playing")
+        logging.debug("GPIO event detected for button %s", button_id)
+        # bouncetime already filters contact bounce; sample the pin once to reject noise spikes
+        if GPIO.input(channel) == GPIO.LOW:
+            queue_press(button_index)
         else:
-            logging.debug(f"False trigger ignored for button {button_id} after delay")
+            logging.debug("False trigger ignored for button %s", button_id)
     return callback
 
 
+def queue_press(button_index: int):
+    """
+    Hand a confirmed button press to the worker unless an announcement is already playing.
+    """
+    button_id = BUTTON_IDS[button_index]
+    if not is_announcement_playing():
+        try:
+            press_queue.put_nowait(button_index)
+        except queue.Full:
+            logging.info("Button %s press dropped - press queue is full", button_id)
+    else:
+        logging.info("Button %s press ignored because an announcement is playing", button_id)
+
+
+def handle_gpio_events(request, pins: dict, last_edge_ns: dict):
+    """
+    Read pending edge events from a gpiod line request; runs on the event loop when its fd is readable.
+    """
+    for event in request.read_edge_events():
+        offset = event.line_offset
+        if event.timestamp_ns - last_edge_ns.get(offset, 0) < GPIO_BOUNCE_NS:
+            continue
+        last_edge_ns[offset] = event.timestamp_ns
+        button_index = pins[offset]
+        logging.debug("GPIO event detected for button %s", BUTTON_IDS[button_index])
+        if request.get_value(offset) == Value.INACTIVE:
+            queue_press(button_index)
+        else:
+            logging.debug("False trigger ignored for button %s", BUTTON_IDS[button_index])
+
+
+async def watch_gpio_fd(fd: int, *args):
+    """
+    Register a gpiod request fd with the running event loop.
+    """
+    asyncio.get_running_loop().add_reader(fd, handle_gpio_events, *args)
+
+
+async def unwatch_gpio_fd(fd: int):
+    """
+    Stop watching a gpiod request fd on the running event loop.
+    """
+    asyncio.get_running_loop().remove_reader(fd)
+
+
+def release_gpiod():
+    """
+    Stop watching and release the current gpiod line request, if any.
+    """
+    global gpio_request
+    if gpio_request is None:
+        return
+    try:
+        run_tts(unwatch_gpio_fd(gpio_request.fd))
+        gpio_request.release()
+    except Exception as e:
+        logging.debug("gpiod release error: %s", e)
+    gpio_request = None
+
+
+def setup_gpiod(config: Config):
+    """
+    Request the button lines from the GPIO character device and watch their edge events
+    on the shared event loop instead of per-pin polling threads.
+    """
+    global gpio_request
+    release_gpiod()
+    pins = {}
+    for button_key, pin in config.gpio.items():
+        if button_key not in BUTTON_IDS:
+            logging.warning(f"Ignoring GPIO assignment for unknown button {button_key}")
+            continue
+        pins[pin] = BUTTON_IDS.index(button_key)
+    line_settings = gpiod.LineSettings(direction=Direction.INPUT, edge_detection=Edge.FALLING, bias=Bias.PULL_UP)
+    try:
+        gpio_request = gpiod.request_lines(GPIO_CHIP, consumer="kartrules", config={tuple(pins): line_settings})
+    except OSError as e:
+        logging.error(f"Failed to request GPIO lines {list(pins)}: {e}")
+        return
+    run_tts(watch_gpio_fd(gpio_request.fd, gpio_request, pins, {}))
+    logging.info("GPIO setup complete; waiting for button presses...")
+
+
+def raise_worker_priority():
+    """
+    Pin the calling thread to the last CPU and switch it to SCHED_FIFO so background I/O
+    cannot delay playback. Only the calling thread is affected: edge events and cache-miss
+    synthesis run on tts_loop at normal priority. Left at normal priority if the service
+    lacks CAP_SYS_NICE.
+    """
+    try:
+        last_cpu = (os.cpu_count() or 1) - 1
+        if last_cpu > 0:
+            os.sched_setaffinity(0, {last_cpu})
+        # SCHED_RESET_ON_FORK keeps a fallback mpg123 process from inheriting real-time priority
+        os.sched_setscheduler(0, os.SCHED_FIFO | os.SCHED_RESET_ON_FORK, os.sched_param(WORKER_RT_PRIORITY))
+        logging.info(f"Press worker running at real-time priority {WORKER_RT_PRIORITY} on CPU {last_cpu}")
+    except (AttributeError, OSError) as e:
+        logging.debug("Could not raise press worker priority: %s", e)
+
+
+def button_worker():
+    """
+    Process queued button presses one at a time for the lifetime of the service.
+    Each press uses whichever config is current when it is dequeued.
+    """
+    raise_worker_priority()
+    while True:
+        button_index = press_queue.get()
+        try:
+            handle_button_press(button_index, current_config)
+        except Exception as e:
+            logging.error(f"Error handling press for {BUTTON_IDS[button_index]}: {e}")
+
+
 def setup_gpio(config: Config):
     """
     Configure GPIO pins and register event detection callbacks.
     """
+    if gpiod is not None:
+        setup_gpiod(config)
+        return
     try:
         GPIO.cleanup()
     except Exception as e:
-        logging.debug(f"GPIO cleanup error: {e}")
+        logging.debug("GPIO cleanup error: %s", e)
     GPIO.setmode(GPIO.BCM)
     GPIO.setwarnings(False)
     for button_key, pin in config.gpio.items():
+        if button_key not in BUTTON_IDS:
+            logging.warning(f"Ignoring GPIO assignment for unknown button {button_key}")
+            continue
         try:
             GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
         except Exception as e:
@@ -273,9 +863,9 @@ def setup_gpio(config: Config):
         try:
             GPIO.remove_event_detect(pin)
         except Exception as e:
-            logging.debug(f"No existing event detection on pin {pin}: {e}")
+            logging.debug("No existing event detection on pin %s: %s", pin, e)
         try:
-            callback = make_callback(button_key, config)
+            callback = make_callback(button_key)
             GPIO.add_event_detect(pin, GPIO.FALLING, callback=callback, bouncetime=500)
         except RuntimeError as e:
             logging.error(f"Failed to add edge detection for pin {pin}: {e}")
@@ -285,81 +875,226 @@ def setup_gpio(config: Config):
 def pre_generate_announcements(config: Config):
     """
     Pre-generate TTS announcement files for all configured buttons.
+    Missing files are synthesized concurrently so the network round-trips overlap.
     """
     logging.info("Pre-generating announcement files...")
+    pending = []
     for button_id, text in config.announcements.items():
         if text:
             logging.info(f"Pre-generating announcement for {button_id}...")
-            cache_file = get_cache_filename(text, config.tts['voice_id'])
-            if os.path.exists(cache_file) and os.path.getsize(cache_file) > 0:
-                logging.info(f"Speech file for {button_id} already exists")
-                continue
+            cache_file = config.cache_files[button_id]
+            if is_cached_file_ready(cache_file):
+                if has_mp3_header(cache_file):
+                    logging.info(f"Speech file for {button_id} already exists")
+                    continue
+                logging.warning(f"Cached speech file for {button_id} is not valid MP3, regenerating")
             logging.info(f"Generating new speech file for {button_id}")
-            success = asyncio.run(synthesize_speech_async(text, config.tts['voice_id'], cache_file))
+            pending.append((button_id, text, cache_file))
+    if pending:
+        results = run_tts(synthesize_batch_async(
+            [(text, config.tts['voice_id'], cache_file) for _, text, cache_file in pending]
+        ))
+        for (button_id, _, cache_file), success in zip(pending, results):
             if success:
                 logging.info(f"Generated speech file for {button_id}")
             else:
-                if os.path.exists(cache_file):
-                    os.remove(cache_file)
+                remove_file(cache_file)
                 logging.error(f"Failed to generate speech file for {button_id}")
+    load_audio_blobs(config)
     logging.info("Finished pre-generating announcements")
 
 
+def load_audio_blobs(config: Config):
+    """
+    Read the cached announcements and the Yiddish recording into memory for playback,
+    and decode them to PCM when direct ALSA playback is available. Decoded PCM is kept in
+    memory too, up to PCM_MEMORY_LIMIT in total.
+    """
+    pcm_bytes = 0
+    sources = dict(config.cache_files)
+    if "button4" in config.gpio:
+        sources["button4"] = YIDDISH_FILE
+    for button_id, path in sources.items():
+        if not is_cached_file_ready(path):
+            continue
+        try:
+            config.audio_blobs[button_id] = Path(path).read_bytes()
+        except OSError as e:
+            logging.warning(f"Failed to load audio for {button_id} into memory: {e}")
+        if alsaaudio is not None and MPG123 is not None and decode_to_pcm(path):
+            try:
+                clip = read_pcm_clip(get_pcm_filename(path))
+            except (OSError, wave.Error) as e:
+                logging.warning(f"Failed to load PCM for {button_id} into memory: {e}")
+                continue
+            if clip is not None and pcm_bytes + len(clip.frames) <= PCM_MEMORY_LIMIT:
+                config.pcm_clips[button_id] = clip
+                pcm_bytes += len(clip.frames)
+
+
+def evict_cache(config: Config, max_bytes: int = CACHE_MAX_BYTES):
+    """
+    Keep the TTS cache under max_bytes by deleting the least recently used files.
+    Files for the current configuration, the decoded Yiddish recording and in-progress partial
+    files are never evicted; partial files older than PARTIAL_MAX_AGE were left by a killed
+    synthesis and are removed.
+    """
+    # The decoded Yiddish recording lives in the cache too and is reused on every boot
+    keep = {get_pcm_filename(YIDDISH_FILE)}
+    for path in config.cache_files.values():
+        keep.add(path)
+        keep.add(get_pcm_filename(path))
+    entries = []
+    total_size = 0
+    now = time.time()
+    try:
+        with os.scandir(CACHE_DIR) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                if entry.name.endswith(".partial"):
+                    if now - entry.stat().st_mtime > PARTIAL_MAX_AGE:
+                        remove_file(entry.path)
+                    continue
+                st = entry.stat()
+                total_size += st.st_size
+                if entry.path not in keep:
+                    entries.append((max(st.st_atime, st.st_mtime), st.st_size, entry.path))
+    except OSError as e:
+        logging.warning(f"Failed to scan cache directory: {e}")
+        return
+    entries.sort()
+    for _, size, path in entries:
+        if total_size <= max_bytes:
+            break
+        remove_file(path)
+        total_size -= size
+        logging.info(f"Evicted cached file {path}")
+
+
 def cleanup():
     """
     Clean up resources on exit by removing the lock file and resetting GPIO.
     """
-    set_announcement_playing(False)
-    GPIO.cleanup()
+    release_announcement_lock()
+    if audio_player is not None:
+        audio_player.stop()
+    if gpiod is not None:
+        release_gpiod()
+    else:
+        GPIO.cleanup()
+
+
+def reload_config(config: Config, config_path: str) -> Config:
+    """
+    Reload the config file, regenerate announcements that changed, and reconfigure GPIO only
+    if the pin assignments changed.
+    Returns the current config untouched if the file was rewritten with identical contents
+    or no longer parses.
+    """
+    global current_config
+    snapshot = None
+    try:
+        snapshot = read_config_file(config_path)
+        if hash_config_data(snapshot[1]) == config.content_hash:
+            logging.debug("Config file touched but contents unchanged, skipping reload")
+            config.last_modified_ns = snapshot[0]
+            return config
+    except OSError as e:
+        logging.warning(f"Could not read config file for change detection: {e}")
+    logging.info("Config file changed, reloading...")
+    try:
+        new_config = load_config(config_path, snapshot)
+    except (configparser.Error, ValueError) as e:
+        # A bad manual edit must not take the button service down; keep the last good config.
+        logging.error(f"Keeping current configuration, config file is invalid: {e}")
+        if snapshot is not None:
+            config.last_modified_ns = snapshot[0]
+        return config
+    regenerate = False
+    if new_config.tts['voice_id'] != config.tts['voice_id']:
+        logging.info("Voice ID changed, regenerating all announcements")
+        regenerate = True
+    else:
+        for button_id, text in new_config.announcements.items():
+            if text != config.announcements.get(button_id, ""):
+                logging.info(f"Announcement for {button_id} changed")
+                regenerate = True
+    current_config = new_config
+    if new_config.gpio != config.gpio:
+        logging.info("GPIO assignments changed, reconfiguring buttons")
+        setup_gpio(new_config)
+    if regenerate:
+        pre_generate_announcements(new_config)
+        evict_cache(new_config)
+    else:
+        load_audio_blobs(new_config)
+    return new_config
+
+
+def watch_config(config: Config, config_path: str):
+    """
+    Block on inotify events for the config file and reload it whenever it is rewritten.
+    The parent directory is watched so the config is still tracked if it is replaced by a rename.
+    """
+    config_dir, config_name = os.path.split(os.path.abspath(config_path))
+    inotify = INotify()
+    inotify.add_watch(config_dir, flags.CLOSE_WRITE | flags.MOVED_TO)
+    logging.info(f"Watching {config_path} for changes with inotify")
+    while True:
+        for event in inotify.read():
+            if event.name == config_name:
+                config = reload_config(config, config_path)
+                break
 
 
 def main():
     """
     Main function to load configuration, set up GPIO, and monitor for config changes.
     """
-    set_announcement_playing(False)
+    global audio_player, current_config
+    release_announcement_lock()
     config_path = "config.ini"
-    last_checked_time = 0
     try:
         config = load_config(config_path)
         pre_generate_announcements(config)
+        evict_cache(config)
     except Exception as e:
         logging.error("Failed to load config. Exiting.")
         sys.exit(1)
+    if MPG123 is None:
+        logging.error("mpg123 is not installed. Exiting.")
+        sys.exit(1)
+    audio_player = RemotePlayer(MPG123)
+    current_config = config
+    asyncio.run_coroutine_threadsafe(warm_up_tts_async(config.tts['voice_id']), tts_loop)
+    threading.Thread(target=button_worker, name="button-worker", daemon=True).start()
     setup_gpio(config)
     try:
-        while True:
-            current_time = time.time()
-            if current_time - last_checked_time > 10:
-                last_checked_time = current_time
-                if os.path.exists(config_path):
-                    mod_time = os.path.getmtime(config_path)
-                    if mod_time > config.last_modified:
-                        logging.info("Config file changed, reloading...")
-                        new_config = load_config(config_path)
-                        regenerate = False
-                        if new_config.tts['voice_id'] != config.tts['voice_id']:
-                            logging.info("Voice ID changed, regenerating all announcements")
-                            regenerate = True
-                        else:
-                            for button_id, text in new_config.announcements.items():
-                                if text != config.announcements.get(button_id, ""):
-                                    logging.info(f"Announcement for {button_id} changed")
-                                    regenerate = True
-                        config = new_config
-                        setup_gpio(config)
-                        if regenerate:
-                            pre_generate_announcements(config)
-            time.sleep(0.1)
+        if INotify is not None:
+            watch_config(config, config_path)
+        else:
+            logging.info("inotify_simple not available, polling config file for changes")
+            while True:
+                time.sleep(CONFIG_POLL_INTERVAL)
+                try:
+                    mod_time_ns = os.stat(config_path).st_mtime_ns
+                except FileNotFoundError:
+                    mod_time_ns = 0
+                if mod_time_ns > config.last_modified_ns:
+                    config = reload_config(config, config_path)
     except KeyboardInterrupt:
         logging.info("Shutdown requested. Cleaning up GPIO.")
         cleanup()
 
 
 if __name__ == '__main__':
-    try:
-        import RPi.GPIO as GPIO
-    except ImportError:
-        logging.error("RPi.GPIO module not found. This code must run on a Raspberry Pi.")
-        sys.exit(1)
+    log_listener.start()
+    atexit.register(log_listener.stop)
+    if gpiod is None:
+        try:
+            import RPi.GPIO as GPIO
+        except ImportError:
+            logging.error("Neither gpiod nor RPi.GPIO found. This code must run on a Raspberry Pi.")
+            sys.exit(1)
     main()
@@ -7,47 +7,174 @@ It handles configuration management, TTS synthesis, playback, log management,
 and provides a web UI for testing announcements including a dedicated Yiddish announcement.
 """
 
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_file
+from flask import Flask, Response, render_template, request, redirect, url_for, flash, jsonify, send_file, session
 import os
+import json
+import math
 import logging
 import asyncio
+import concurrent.futures
+import configparser
 import tempfile
+import shutil
 import subprocess
 import edge_tts
 import time
 import datetime
 import threading
+import queue
 import atexit
 import hashlib
+import wave
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from logging.handlers import RotatingFileHandler  # Import rotating logs handler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler  # Import rotating logs handler
 
-# Configure rotating logging to limit log file size and keep backups.
-rotating_handler = RotatingFileHandler("announcement_script.log", maxBytes=5000000, backupCount=2)
+try:
+    import alsaaudio
+except ImportError:
+    alsaaudio = None
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+except ImportError:
+    orjson = None
+
+
+class FastRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that skips the per-record exists/isfile stat calls made by newer Python
+    versions; the log path is always a regular file here, so only the size check is needed.
+    """
+    def shouldRollover(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes > 0:
+            msg = "%s\n" % self.format(record)
+            self.stream.seek(0, 2)
+            if self.stream.tell() + len(msg) >= self.maxBytes:
+                return True
+        return False
+
+
+# Configure rotating logging to limit log file size and keep backups. Log calls only enqueue
+# records; a listener thread started by startup() does the file and console writes.
+rotating_handler = FastRotatingFileHandler("announcement_script.log", maxBytes=5000000, backupCount=2)
 rotating_handler.setLevel(logging.INFO)
 rotating_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S"))
-
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, rotating_handler, logging.StreamHandler(), respect_handler_level=True)
 logging.basicConfig(
     level=logging.INFO,
-    handlers=[rotating_handler, logging.StreamHandler()]
+    handlers=[QueueHandler(log_queue)]
 )
 
 # Shared state file path (used to indicate an announcement is playing)
 ANNOUNCEMENT_LOCK_FILE = "/tmp/announcement_playing.lock"
 
+# In-process flag set while this service is playing an announcement
+announcement_playing = threading.Event()
+
+# Mirrors whether the lock file exists while watch_lock_file is running, so status checks need no stat
+lock_file_present = threading.Event()
+lock_file_watched = False
+
+# Notified whenever this service starts or stops playing, to wake /announcement_status_stream clients
+status_changed = threading.Condition()
+
 # Directory for cached TTS files
 CACHE_DIR = "/tmp/tts_cache"
 os.makedirs(CACHE_DIR, exist_ok=True)
 
+# TTS engine version, folded into the cache key so an edge-tts upgrade regenerates cached audio
+TTS_ENGINE_TAG = f"edge-tts/{getattr(edge_tts, '__version__', 'unknown')}".encode()[:16]
+
+# Path to the pre-recorded Yiddish announcement
+YIDDISH_FILE = "/home/tech/yiddish.mp3"
+
+# Decoded Yiddish announcement, loaded at startup when direct ALSA playback is available
+yiddish_clip = None
+
+# Resolve the mpg123 binary once instead of probing for it on every playback
+MPG123 = shutil.which("mpg123")
+
+# Long-lived event loop for TTS synthesis, shared by request handlers and background pre-generation
+tts_loop = asyncio.new_event_loop()
+threading.Thread(target=tts_loop.run_forever, name="tts-loop", daemon=True).start()
+
+# In-flight syntheses keyed by output path; only used from the tts_loop thread
+synthesis_tasks = {}
+
+# Parsed config.ini contents keyed by path, as (st_mtime_ns, config dict), shared by all requests
+config_cache = {}
+config_cache_lock = threading.Lock()
+
 # Global variables for announcement control
 last_announcement_time = 0
 ANNOUNCEMENT_COOLDOWN = 8.0  # seconds to wait between announcements
+STATUS_STREAM_KEEPALIVE = 15.0  # seconds between keepalive comments on the status stream
+STATUS_STREAM_MAX_AGE = 300.0  # seconds before a status stream is closed so the browser reconnects
+STATUS_STREAM_LIMIT = 4  # concurrent status streams, each holding a server thread; extra clients poll
+
+# Free status stream slots, taken by /announcement_status_stream and returned when the response closes
+status_stream_slots = threading.BoundedSemaphore(STATUS_STREAM_LIMIT)
+TTS_REQUEST_TIMEOUT = 30.0  # seconds a web request waits for synthesis before giving up
+TTS_MAX_CONCURRENCY = 3  # syntheses allowed in flight at once during pre-generation
+
+# Rendered index page as (config dict, year, html), reused until the cached config is replaced
+index_cache = {}
+INDEX_CLOCK_PLACEHOLDER = "__INDEX_CLOCK__"
+
+# Lines shown by /logs, read backwards from the end of the log file LOG_READ_BLOCK bytes at a time
+LOG_TAIL_LINES = 1000
+LOG_READ_BLOCK = 64 * 1024
+
+# Cache directory totals reported by /cache_status, rescanned only when the directory's mtime changes.
+# Files are always published by rename, so any added, replaced or removed file moves the mtime.
+cache_stats = {'count': 0, 'bytes': 0, 'dir_mtime_ns': None}
+cache_stats_lock = threading.Lock()
+
+# Size cap for the TTS cache, matching the button service so neither process fights the other
+CACHE_MAX_BYTES = 10 * 1024 * 1024
+
+# Age in seconds after which a .partial file in the cache is taken to be left over from a killed process
+PARTIAL_MAX_AGE = 600
 
 # Initialize Flask application
 app = Flask(__name__, 
             static_folder='static',
             template_folder='templates')
 app.secret_key = 'your_secret_key_here'  # Change this in production!
+if orjson is not None:
+    class OrjsonProvider(DefaultJSONProvider):
+        """
+        JSON provider that serializes jsonify() responses and parses request bodies with orjson.
+        """
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = OrjsonProvider(app)
+if Compress is not None:
+    # gzip buffered text responses such as the page and /logs. Streamed responses, which include
+    # every send_file download, are left alone so they keep sendfile, Range requests and their ETags.
+    app.config['COMPRESS_MIMETYPES'] = ['text/html', 'text/css', 'text/plain', 'application/javascript', 'application/json']
+    app.config['COMPRESS_STREAMS'] = False
+    Compress(app)
 
 # Application startup time (for uptime calculation)
 start_time = time.time()
@@ -55,33 +182,144 @@ start_time = time.time()
 
 def is_announcement_playing():
     """
-    Check if an announcement is currently playing by verifying the existence of the lock file.
+    Check if an announcement is currently playing.
+    The in-process flag is checked first; the lock file is only consulted for playback started by the button service,
+    through the inotify watcher when it is running.
     """
+    if announcement_playing.is_set():
+        return True
+    if lock_file_watched:
+        return lock_file_present.is_set()
     return os.path.exists(ANNOUNCEMENT_LOCK_FILE)
 
 
-def set_announcement_playing(is_playing=True):
+def release_announcement_lock():
     """
-    Set the announcement playing status by creating or removing the lock file.
+    Clear the in-process flag and remove the lock file claimed by try_acquire_announcement_lock.
     """
-    if is_playing:
-        with open(ANNOUNCEMENT_LOCK_FILE, 'w') as f:
-            f.write(str(time.time()))
-    else:
-        if os.path.exists(ANNOUNCEMENT_LOCK_FILE):
-            try:
-                os.remove(ANNOUNCEMENT_LOCK_FILE)
-            except Exception as e:
-                logging.warning(f"Failed to remove lock file: {e}")
+    announcement_playing.clear()
+    try:
+        os.remove(ANNOUNCEMENT_LOCK_FILE)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.warning(f"Failed to remove lock file: {e}")
+    notify_status_changed()
+
+
+def notify_status_changed():
+    """
+    Wake any clients streaming the announcement status.
+    """
+    with status_changed:
+        status_changed.notify_all()
+
+
+def start_lock_file_watcher():
+    """
+    Start tracking the lock file with inotify so status checks stop polling it and streaming
+    clients are woken as soon as the button service starts or finishes an announcement.
+    Does nothing if inotify_simple is not installed.
+    """
+    global lock_file_watched
+    if INotify is None:
+        logging.info("inotify_simple not available, checking the lock file on each status request")
+        return
+    lock_dir, lock_name = os.path.split(ANNOUNCEMENT_LOCK_FILE)
+    try:
+        inotify = INotify()
+        inotify.add_watch(lock_dir, flags.CREATE | flags.MOVED_TO | flags.DELETE | flags.MOVED_FROM)
+    except OSError as e:
+        logging.warning(f"Failed to watch {ANNOUNCEMENT_LOCK_FILE}: {e}")
+        return
+    # Take the initial state only once the watch is in place so no transition is missed
+    if os.path.exists(ANNOUNCEMENT_LOCK_FILE):
+        lock_file_present.set()
+    lock_file_watched = True
+    threading.Thread(target=watch_lock_file, args=(inotify, lock_name), name="lock-watcher", daemon=True).start()
 
 
+def watch_lock_file(inotify, lock_name: str):
+    """
+    Block on inotify events for the lock file's directory and mirror the lock file's existence
+    into lock_file_present.
+    """
+    while True:
+        changed = False
+        for event in inotify.read():
+            if event.name != lock_name:
+                continue
+            if event.mask & (flags.CREATE | flags.MOVED_TO):
+                lock_file_present.set()
+            else:
+                lock_file_present.clear()
+            changed = True
+        if changed:
+            notify_status_changed()
+
+
+def try_acquire_announcement_lock() -> bool:
+    """
+    Atomically claim the announcement lock file with O_EXCL.
+    Returns False if this service or the button service is already playing an announcement.
+    """
+    if announcement_playing.is_set():
+        return False
+    try:
+        fd = os.open(ANNOUNCEMENT_LOCK_FILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+    except FileExistsError:
+        return False
+    try:
+        os.write(fd, str(time.time()).encode())
+    finally:
+        os.close(fd)
+    announcement_playing.set()
+    notify_status_changed()
+    return True
+
+
+def normalize_text_bytes(text_bytes: bytes) -> bytes:
+    """
+    Trim UTF-8 announcement text and collapse runs of whitespace to single spaces, so edits that
+    only change spacing or line breaks share a cache entry. Must match kartrules.py.
+    """
+    return b' '.join(text_bytes.split())
+
+
+@lru_cache(maxsize=512)
 def get_cache_filename(text: str, voice_id: str):
     """
     Generate a unique cache filename for synthesized speech based on the announcement text and voice ID.
+    Results are memoized since the same announcements are tested repeatedly.
+    """
+    # Keying the hash by voice ID keeps (text, voice_id) pairs distinct without a separator;
+    # the personalization string ties the entry to the TTS engine version.
+    hash_object = hashlib.blake2b(
+        normalize_text_bytes(text.encode()), key=voice_id.encode()[:64], person=TTS_ENGINE_TAG, digest_size=16
+    )
+    return os.path.join(CACHE_DIR, f"{hash_object.hexdigest()}.mp3")
+
+
+def remove_file(path: str):
+    """
+    Remove a file with a single unlink, ignoring it if it is already gone.
     """
-    hash_object = hashlib.md5((text + voice_id).encode())
-    hash_str = hash_object.hexdigest()
-    return os.path.join(CACHE_DIR, f"{hash_str}.mp3")
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logging.warning(f"Failed to remove {path}: {e}")
+
+
+def is_cached_file_ready(path: str) -> bool:
+    """
+    Check that an audio file exists and is non-empty using a single stat call.
+    """
+    try:
+        return os.stat(path).st_size > 0
+    except OSError:
+        return False
 
 
 class ConfigHandler:
@@ -112,62 +350,126 @@ class ConfigHandler:
         Read configuration settings from the config file.
         """
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    current_section = None
-                    for line in f:
-                        line = line.strip()
-                        if not line or line.startswith('#'):
-                            continue
-                        if line.startswith('[') and line.endswith(']'):
-                            current_section = line[1:-1].lower()
-                            continue
-                        if '=' in line:
-                            key, value = [x.strip() for x in line.split('=', 1)]
-                            value = value.strip('"\'')
-                            if current_section == 'announcements':
-                                self.config['announcements'][key.lower()] = value
-                            elif current_section == 'tts':
-                                self.config['tts'][key.lower()] = value
-                            elif current_section == 'gpio':
-                                try:
-                                    self.config['gpio'][key.lower()] = int(value)
-                                except ValueError:
-                                    logging.warning(f"Invalid GPIO pin value for {key}: {value}")
+            # RawConfigParser never interpolates, so announcement text may contain '%' characters.
+            # A missing config file is skipped by read(), leaving the defaults in place.
+            parser = configparser.RawConfigParser(strict=False, delimiters=('=',))
+            parser.read(self.config_file)
+            for section in parser.sections():
+                current_section = section.lower()
+                if current_section not in self.config:
+                    continue
+                for key, value in parser.items(section):
+                    value = value.strip('"\'')
+                    if current_section == 'gpio':
+                        try:
+                            self.config['gpio'][key] = int(value)
+                        except ValueError:
+                            logging.warning(f"Invalid GPIO pin value for {key}: {value}")
+                    else:
+                        self.config[current_section][key] = value
             return self.config
         except Exception as e:
             logging.error(f"Error reading config: {e}")
             return self.config
 
+    @classmethod
+    def get_shared_config(cls, config_file: str = "config.ini"):
+        """
+        Return the cached configuration shared by all requests, re-parsing the config file only
+        when its mtime changes. The result must not be modified.
+        """
+        try:
+            mtime_ns = os.stat(config_file).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        with config_cache_lock:
+            cached = config_cache.get(config_file)
+            if cached is None or cached[0] != mtime_ns:
+                cached = (mtime_ns, cls(config_file).read_config())
+                config_cache[config_file] = cached
+        return cached[1]
+
+    @classmethod
+    def read_config_cached(cls, config_file: str = "config.ini"):
+        """
+        Return a copy of the cached configuration that the caller may modify before writing it back.
+        """
+        return {section: dict(values) for section, values in cls.get_shared_config(config_file).items()}
+
     def write_config(self):
         """
         Write the current configuration settings to the config file.
+        The file is written to a temporary sibling and renamed over the config, so readers in
+        either service see the old or the new file and never a partly written one.
         """
         try:
-            with open(self.config_file, 'w') as f:
-                f.write("[announcements]\n")
-                for key, value in self.config['announcements'].items():
-                    f.write(f"{key} = {value}\n")
-                f.write("\n[tts]\n")
-                for key, value in self.config['tts'].items():
-                    f.write(f"{key} = {value}\n")
-                f.write("\n[gpio]\n")
-                for key, value in self.config['gpio'].items():
-                    f.write(f"{key} = {value}\n")
+            parser = configparser.RawConfigParser()
+            for section in ('announcements', 'tts', 'gpio'):
+                parser[section] = {key: str(value) for key, value in self.config[section].items()}
+            config_dir = os.path.dirname(os.path.abspath(self.config_file))
+            fd, temp_path = tempfile.mkstemp(dir=config_dir, prefix=".config.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    parser.write(f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.chmod(temp_path, 0o644)
+                os.replace(temp_path, self.config_file)
+            except BaseException:
+                remove_file(temp_path)
+                raise
+            # Refresh the shared cache with what was just written instead of re-parsing it
+            with config_cache_lock:
+                config_cache[self.config_file] = (
+                    os.stat(self.config_file).st_mtime_ns,
+                    {section: dict(values) for section, values in self.config.items()}
+                )
         except Exception as e:
             logging.error(f"Error writing config: {e}")
             raise
 
 
+def current_voice_id() -> str:
+    """
+    Return the configured TTS voice ID without copying the cached config.
+    """
+    return ConfigHandler.get_shared_config()['tts']['voice_id']
+
+
+def current_output_format() -> str:
+    """
+    Return the configured output format without copying the cached config.
+    """
+    return ConfigHandler.get_shared_config()['tts']['output_format']
+
+
 async def synthesize_speech_async(text: str, voice_id: str, output_path: str) -> bool:
     """
     Asynchronously synthesize speech from text using Microsoft Edge TTS.
+    Concurrent calls for the same output path, such as a test play racing pre-generation,
+    share a single synthesis.
+    """
+    task = synthesis_tasks.get(output_path)
+    if task is None:
+        task = asyncio.ensure_future(synthesize_to_file_async(text, voice_id, output_path))
+        synthesis_tasks[output_path] = task
+        task.add_done_callback(lambda _: synthesis_tasks.pop(output_path, None))
+    # Shielded so a caller that times out does not cancel the synthesis for the others
+    return await asyncio.shield(task)
+
+
+async def synthesize_to_file_async(text: str, voice_id: str, output_path: str) -> bool:
     """
+    Synthesize speech into output_path. Audio is written to a partial file named for this
+    process and renamed into place, so a cache hit in either service never sees a truncated MP3.
+    """
+    partial_path = f"{output_path}.{os.getpid()}.partial"
     try:
         logging.info(f"Synthesizing speech: {text[:50]}...")
         communicate = edge_tts.Communicate(text, voice_id)
-        await communicate.save(output_path)
-        if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+        await communicate.save(partial_path)
+        if is_cached_file_ready(partial_path):
+            os.replace(partial_path, output_path)
             logging.info("Speech synthesis successful")
             return True
         else:
@@ -176,32 +478,284 @@ async def synthesize_speech_async(text: str, voice_id: str, output_path: str) ->
     except Exception as e:
         logging.error(f"Error during speech synthesis: {e}")
         return False
+    finally:
+        remove_file(partial_path)
+
+
+async def stream_and_cache_async(text: str, voice_id: str, output_path: str) -> bool:
+    """
+    Synthesize speech and play it as the audio arrives, writing the same bytes to the cache.
+    Used on a cache miss so playback does not wait for the whole file to be synthesized.
+    Gives up if the TTS service sends nothing for TTS_REQUEST_TIMEOUT seconds. The limit applies
+    to each wait for the next chunk rather than the whole call, which also spans playback.
+    """
+    partial_path = f"{output_path}.{os.getpid()}.stream.partial"
+    player = None
+    stream = None
+    player_failed = False
+    try:
+        logging.info(f"Streaming speech: {text[:50]}...")
+        player = await asyncio.create_subprocess_exec(MPG123, '-q', '-', stdin=subprocess.PIPE)
+        communicate = edge_tts.Communicate(text, voice_id)
+        stream = communicate.stream()
+        with open(partial_path, 'wb') as f:
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(anext(stream), TTS_REQUEST_TIMEOUT)
+                except StopAsyncIteration:
+                    break
+                if chunk["type"] != "audio":
+                    continue
+                f.write(chunk["data"])
+                if not player_failed:
+                    try:
+                        player.stdin.write(chunk["data"])
+                        await player.stdin.drain()
+                    except (BrokenPipeError, ConnectionResetError):
+                        # Keep caching the rest of the speech so the next press can play it
+                        logging.warning("mpg123 exited during streamed playback, caching the rest unplayed")
+                        player_failed = True
+        player.stdin.close()
+        returncode = await player.wait()
+        if is_cached_file_ready(partial_path):
+            os.replace(partial_path, output_path)
+            logging.info("Speech synthesis successful")
+        else:
+            logging.error("Speech synthesis failed - output file empty or missing")
+            return False
+        return returncode == 0 and not player_failed
+    except Exception as e:
+        logging.error(f"Error during streamed speech synthesis: {e!r}")
+        if player is not None and player.returncode is None:
+            player.kill()
+            await player.wait()
+        return False
+    finally:
+        if stream is not None:
+            await stream.aclose()
+        remove_file(partial_path)
+
+
+def run_tts(coro, timeout: float = None):
+    """
+    Run a coroutine on the shared TTS event loop and block until it completes.
+    If a timeout is given and expires, the coroutine is cancelled and TimeoutError is raised.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, tts_loop)
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+def get_pcm_filename(sound_path: str) -> str:
+    """
+    Return the path of the decoded WAV copy the button service keeps for an MP3 in the TTS cache.
+    """
+    name = os.path.splitext(os.path.basename(sound_path))[0]
+    return os.path.join(CACHE_DIR, f"{name}.wav")
+
+
+def get_fresh_pcm_filename(sound_path: str):
+    """
+    Return the decoded WAV for an MP3 if the button service has produced one at least as new
+    as the MP3, otherwise None.
+    """
+    pcm_path = get_pcm_filename(sound_path)
+    try:
+        pcm_stat = os.stat(pcm_path)
+        if pcm_stat.st_size > 0 and pcm_stat.st_mtime_ns >= os.stat(sound_path).st_mtime_ns:
+            return pcm_path
+    except OSError:
+        pass
+    return None
+
+
+@dataclass(slots=True, frozen=True)
+class PcmClip:
+    """
+    Decoded 16-bit PCM audio held in memory for direct ALSA playback.
+    """
+    channels: int
+    rate: int
+    frames: bytes
 
 
-def play_sound(sound_path: str, output_format: str = 'mp3') -> bool:
+def read_pcm_clip(pcm_path: str):
     """
-    Play the given sound file using mpg123. Clears the announcement lock after playback.
+    Read a decoded WAV file into a PcmClip, or return None if it is not 16-bit PCM.
     """
-    if not sound_path or not os.path.exists(sound_path):
+    with wave.open(pcm_path, 'rb') as wav:
+        if wav.getsampwidth() != 2:
+            return None
+        return PcmClip(wav.getnchannels(), wav.getframerate(), wav.readframes(wav.getnframes()))
+
+
+def play_pcm(clip: PcmClip) -> bool:
+    """
+    Write decoded PCM straight to the ALSA playback device.
+    """
+    device = alsaaudio.PCM(
+        alsaaudio.PCM_PLAYBACK,
+        channels=clip.channels,
+        rate=clip.rate,
+        format=alsaaudio.PCM_FORMAT_S16_LE,
+        periodsize=1024
+    )
+    try:
+        frames = memoryview(clip.frames)
+        period_bytes = 1024 * clip.channels * 2
+        for offset in range(0, len(frames), period_bytes):
+            device.write(frames[offset:offset + period_bytes])
+        if hasattr(device, 'drain'):
+            device.drain()
+    finally:
+        device.close()
+    return True
+
+
+def load_yiddish_clip():
+    """
+    Decode the Yiddish recording to PCM once and keep it in memory for /play_yiddish.
+    The button service's decoded WAV is reused when it is current; otherwise mpg123 decodes it here.
+    """
+    global yiddish_clip
+    if alsaaudio is None or not os.path.exists(YIDDISH_FILE):
+        return
+    pcm_path = get_fresh_pcm_filename(YIDDISH_FILE)
+    try:
+        if pcm_path is None:
+            if MPG123 is None:
+                return
+            pcm_path = get_pcm_filename(YIDDISH_FILE)
+            partial_path = f"{pcm_path}.{os.getpid()}.partial"
+            try:
+                subprocess.run([MPG123, '-q', '-w', partial_path, YIDDISH_FILE], check=True)
+                os.replace(partial_path, pcm_path)
+            finally:
+                remove_file(partial_path)
+        yiddish_clip = read_pcm_clip(pcm_path)
+        logging.info("Yiddish announcement loaded into memory")
+    except Exception as e:
+        logging.warning(f"Failed to preload Yiddish announcement: {e}")
+
+
+def play_sound(sound_path: str, output_format: str = 'mp3', pcm_clip: PcmClip = None) -> bool:
+    """
+    Play the given sound file. Clears the announcement lock after playback.
+    When pyalsaaudio is installed, PCM already in memory or decoded by the button service is
+    written directly to ALSA; otherwise the MP3 is played with mpg123.
+    """
+    if pcm_clip is None and (not sound_path or not os.path.exists(sound_path)):
         logging.error(f"Invalid sound path: {sound_path}")
         return False
     try:
         logging.info(f"Playing sound file: {sound_path}")
+        if alsaaudio is not None:
+            pcm_path = get_fresh_pcm_filename(sound_path) if pcm_clip is None else None
+            if pcm_clip is not None or pcm_path is not None:
+                try:
+                    clip = pcm_clip if pcm_clip is not None else read_pcm_clip(pcm_path)
+                    if clip is not None and play_pcm(clip):
+                        logging.info("Sound played successfully")
+                        return True
+                except Exception as e:
+                    logging.warning(f"PCM playback failed, falling back to mpg123: {e}")
         # Check if mpg123 is installed
-        if subprocess.run(['which', 'mpg123'], capture_output=True).returncode != 0:
+        if MPG123 is None:
             logging.error("mpg123 is not installed")
             return False
-        subprocess.run(['mpg123', '-q', sound_path], check=True)
+        subprocess.run([MPG123, '-q', sound_path], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
         logging.info("Sound played successfully")
         return True
     except subprocess.CalledProcessError as e:
-        logging.error(f"Error playing sound: {e}")
+        logging.error(f"Error playing sound: {e}: {e.stderr.decode(errors='replace').strip()}")
         return False
     except Exception as e:
         logging.error(f"Error playing sound: {e}")
         return False
     finally:
-        set_announcement_playing(False)
+        release_announcement_lock()
+
+
+def get_cache_stats():
+    """
+    Return (file_count, total_bytes) for the TTS cache. The directory is stat'ed on each call
+    but only rescanned with os.scandir when its mtime has changed or the totals were invalidated.
+    """
+    try:
+        dir_mtime_ns = os.stat(CACHE_DIR).st_mtime_ns
+    except FileNotFoundError:
+        return 0, 0
+    with cache_stats_lock:
+        if cache_stats['dir_mtime_ns'] != dir_mtime_ns:
+            count = 0
+            total_size = 0
+            try:
+                with os.scandir(CACHE_DIR) as it:
+                    for entry in it:
+                        if entry.is_file():
+                            count += 1
+                            total_size += entry.stat().st_size
+            except FileNotFoundError:
+                pass
+            cache_stats.update(count=count, bytes=total_size, dir_mtime_ns=dir_mtime_ns)
+        return cache_stats['count'], cache_stats['bytes']
+
+
+def invalidate_cache_stats():
+    """
+    Force the next /cache_status request to rescan the cache directory.
+    """
+    with cache_stats_lock:
+        cache_stats['dir_mtime_ns'] = None
+
+
+def evict_cache(keep_files=(), max_bytes: int = CACHE_MAX_BYTES):
+    """
+    Keep the TTS cache under max_bytes by deleting the least recently used files.
+    Files for the configured announcements, any paths in keep_files, their decoded WAVs, the
+    decoded Yiddish recording and in-progress partial files are never evicted; partial files
+    older than PARTIAL_MAX_AGE were left by a killed synthesis and are removed.
+    """
+    config = ConfigHandler.get_shared_config()
+    voice_id = config['tts']['voice_id']
+    keep = set(keep_files)
+    if voice_id:
+        keep.update(get_cache_filename(text, voice_id) for text in config['announcements'].values() if text)
+    keep.update([get_pcm_filename(path) for path in keep])
+    keep.add(get_pcm_filename(YIDDISH_FILE))
+    entries = []
+    total_size = 0
+    now = time.time()
+    try:
+        with os.scandir(CACHE_DIR) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                if entry.name.endswith(".partial"):
+                    if now - entry.stat().st_mtime > PARTIAL_MAX_AGE:
+                        remove_file(entry.path)
+                    continue
+                st = entry.stat()
+                total_size += st.st_size
+                if entry.path not in keep:
+                    entries.append((max(st.st_atime, st.st_mtime), st.st_size, entry.path))
+    except OSError as e:
+        logging.warning(f"Failed to scan cache directory: {e}")
+        return
+    entries.sort()
+    evicted = False
+    for _, size, path in entries:
+        if total_size <= max_bytes:
+            break
+        remove_file(path)
+        total_size -= size
+        evicted = True
+        logging.info(f"Evicted cached file {path}")
+    if evicted:
+        invalidate_cache_stats()
 
 
 def get_system_uptime():
@@ -212,7 +766,7 @@ def get_system_uptime():
     return str(datetime.timedelta(seconds=int(uptime_seconds)))
 
 
-def pre_generate_announcement(text: str, voice_id: str):
+async def pre_generate_announcement_async(text: str, voice_id: str):
     """
     Generate and cache a single announcement file for the provided text and voice ID.
     """
@@ -220,17 +774,16 @@ def pre_generate_announcement(text: str, voice_id: str):
         return None
     try:
         cache_file = get_cache_filename(text, voice_id)
-        if os.path.exists(cache_file) and os.path.getsize(cache_file) > 0:
+        if is_cached_file_ready(cache_file):
             logging.info(f"Using existing cached file: {cache_file}")
             return cache_file
         logging.info(f"Generating new speech file for: {text[:50]}...")
-        success = asyncio.run(synthesize_speech_async(text, voice_id, cache_file))
+        success = await synthesize_speech_async(text, voice_id, cache_file)
         if success:
             logging.info(f"Successfully generated cached file: {cache_file}")
+            invalidate_cache_stats()
             return cache_file
         else:
-            if os.path.exists(cache_file):
-                os.remove(cache_file)
             logging.error("Failed to generate speech file")
             return None
     except Exception as e:
@@ -238,47 +791,112 @@ def pre_generate_announcement(text: str, voice_id: str):
         return None
 
 
+async def pre_generate_batch_async(texts, voice_id: str) -> list:
+    """
+    Generate or verify several announcement files concurrently, with at most
+    TTS_MAX_CONCURRENCY syntheses in flight at once.
+    """
+    semaphore = asyncio.Semaphore(TTS_MAX_CONCURRENCY)
+
+    async def generate(text):
+        async with semaphore:
+            return await pre_generate_announcement_async(text, voice_id)
+    return await asyncio.gather(*(generate(text) for text in texts))
+
+
 def pre_generate_all_announcements():
     """
     Pre-generate all announcement files based on the current configuration.
+    Announcements are synthesized concurrently so the network round-trips overlap.
     """
     logging.info("Pre-generating all announcement files...")
-    config_handler = ConfigHandler()
-    config = config_handler.read_config()
+    config = ConfigHandler.get_shared_config()
     voice_id = config['tts']['voice_id']
     if not voice_id:
         logging.error("Voice ID not configured, skipping pre-generation")
         return
-    for button_id, text in config['announcements'].items():
-        if text:
-            logging.info(f"Pre-generating announcement for {button_id}...")
-            speech_file = pre_generate_announcement(text, voice_id)
-            if speech_file:
-                logging.info(f"Generated/verified speech file for {button_id}")
-            else:
-                logging.error(f"Failed to generate speech file for {button_id}")
+    pending = [(button_id, text) for button_id, text in config['announcements'].items() if text]
+    for button_id, _ in pending:
+        logging.info(f"Pre-generating announcement for {button_id}...")
+    speech_files = run_tts(pre_generate_batch_async([text for _, text in pending], voice_id))
+    for (button_id, _), speech_file in zip(pending, speech_files):
+        if speech_file:
+            logging.info(f"Generated/verified speech file for {button_id}")
+        else:
+            logging.error(f"Failed to generate speech file for {button_id}")
+    evict_cache()
     logging.info("Finished pre-generating announcements")
 
 
-@app.route('/')
-def index():
+def pre_generation_worker():
     """
-    Render the main configuration page.
+    Run queued pre-generation requests one at a time for the lifetime of the service.
+    """
+    while True:
+        pre_generation_queue.get()
+        try:
+            pre_generate_all_announcements()
+        except Exception as e:
+            logging.error(f"Error pre-generating announcements: {e}")
+
+
+def request_pre_generation():
+    """
+    Ask the background worker to regenerate announcements. Requests made while one is
+    already waiting are coalesced, since the pending run will read the latest config anyway.
+    """
+    try:
+        pre_generation_queue.put_nowait(True)
+    except queue.Full:
+        logging.debug("Pre-generation already pending, request coalesced")
+
+
+# Single-slot queue feeding one long-lived pre-generation worker
+pre_generation_queue = queue.Queue(maxsize=1)
+threading.Thread(target=pre_generation_worker, name="pre-generation", daemon=True).start()
+
+
+class ClockPlaceholder:
+    """
+    Stand-in for the render time in the cached index page; the real time is substituted per request.
+    """
+    def strftime(self, fmt):
+        return INDEX_CLOCK_PLACEHOLDER
+
+
+def render_index(config, current_time, current_year):
+    """
+    Render config.html for the given config dict and time values.
     """
-    config_handler = ConfigHandler()
-    config = config_handler.read_config()
-    current_time = datetime.datetime.now()
     return render_template(
         'config.html', 
         announcements=config['announcements'], 
         tts=config['tts'],
         gpio=config['gpio'],
         current_time=current_time,
-        current_year=current_time.year,
+        current_year=current_year,
         uptime=get_system_uptime()
     )
 
 
+@app.route('/')
+def index():
+    """
+    Render the main configuration page.
+    The page is rendered once per config and year with a placeholder for the clock, and reused
+    until the config changes. Requests with pending flash messages are always rendered in full.
+    """
+    config = ConfigHandler.get_shared_config()
+    current_time = datetime.datetime.now()
+    if '_flashes' in session:
+        return render_index(config, current_time, current_time.year)
+    cached = index_cache.get('page')
+    if cached is None or cached[0] is not config or cached[1] != current_time.year:
+        cached = (config, current_time.year, render_index(config, ClockPlaceholder(), current_time.year))
+        index_cache['page'] = cached
+    return cached[2].replace(INDEX_CLOCK_PLACEHOLDER, current_time.strftime('%H:%M:%S'))
+
+
 @app.route('/save_config', methods=['POST'])
 def save_config():
     """
@@ -286,7 +904,7 @@ def save_config():
     """
     try:
         config_handler = ConfigHandler()
-        config = config_handler.read_config()
+        config = ConfigHandler.read_config_cached()
         old_announcements = config['announcements'].copy()
         old_voice_id = config['tts']['voice_id']
         config['announcements']['button1'] = request.form['button1']
@@ -297,8 +915,8 @@ def save_config():
         config_handler.config = config
         config_handler.write_config()
         voice_changed = old_voice_id != config['tts']['voice_id']
-        set_announcement_playing(False)
-        threading.Thread(target=pre_generate_all_announcements).start()
+        release_announcement_lock()
+        request_pre_generation()
         try:
             subprocess.run(['sudo', 'systemctl', 'restart', 'gpio-buttons.service'], check=True)
             logging.info("gpio-buttons.service restarted successfully")
@@ -330,45 +948,59 @@ def play_instant():
     Play an announcement immediately using the provided text.
     """
     global last_announcement_time
-    if is_announcement_playing():
-        logging.info("Announcement request ignored - another announcement is currently playing")
-        return jsonify({'error': 'Another announcement is currently playing'}), 429
     current_time = time.time()
     if current_time - last_announcement_time < ANNOUNCEMENT_COOLDOWN:
         logging.info("Announcement request ignored - too soon after previous announcement")
         return jsonify({'error': 'Please wait before playing another announcement'}), 429
+    if not try_acquire_announcement_lock():
+        logging.info("Announcement request ignored - another announcement is currently playing")
+        return jsonify({'error': 'Another announcement is currently playing'}), 429
     last_announcement_time = current_time
-    set_announcement_playing(True)
     try:
         data = request.get_json()
         if not data or 'text' not in data:
-            set_announcement_playing(False)
+            release_announcement_lock()
             return jsonify({'error': 'Missing text parameter'}), 400
         text = data['text']
         if not text:
-            set_announcement_playing(False)
+            release_announcement_lock()
             return jsonify({'error': 'Empty announcement text'}), 400
-        config_handler = ConfigHandler()
-        config = config_handler.read_config()
-        voice_id = config['tts']['voice_id']
-        output_format = config['tts']['output_format']
+        voice_id = current_voice_id()
+        output_format = current_output_format()
         cache_file = get_cache_filename(text, voice_id)
-        if not os.path.exists(cache_file) or os.path.getsize(cache_file) == 0:
+        if not is_cached_file_ready(cache_file):
+            if MPG123 is not None:
+                # Play while synthesizing instead of waiting for the whole file to be written
+                logging.info(f"Cache miss - streaming new speech for: {text[:50]}...")
+                try:
+                    played = run_tts(stream_and_cache_async(text, voice_id, cache_file))
+                finally:
+                    release_announcement_lock()
+                invalidate_cache_stats()
+                evict_cache((cache_file,))
+                if played:
+                    return jsonify({'success': True, 'message': 'Announcement played successfully'}), 200
+                return jsonify({'error': 'Failed to synthesize or play speech'}), 500
             logging.info(f"Cache miss - generating new speech file for: {text[:50]}...")
-            success = asyncio.run(synthesize_speech_async(text, voice_id, cache_file))
+            try:
+                success = run_tts(synthesize_speech_async(text, voice_id, cache_file), TTS_REQUEST_TIMEOUT)
+            except concurrent.futures.TimeoutError:
+                logging.error(f"Speech synthesis timed out after {TTS_REQUEST_TIMEOUT:g} seconds")
+                release_announcement_lock()
+                return jsonify({'error': 'Speech synthesis timed out'}), 504
             if not success:
-                if os.path.exists(cache_file):
-                    os.remove(cache_file)
-                set_announcement_playing(False)
+                release_announcement_lock()
                 return jsonify({'error': 'Failed to synthesize speech'}), 500
+            invalidate_cache_stats()
+            evict_cache((cache_file,))
         if play_sound(cache_file, output_format):
             return jsonify({'success': True, 'message': 'Announcement played successfully'}), 200
         else:
-            set_announcement_playing(False)
+            release_announcement_lock()
             return jsonify({'error': 'Failed to play announcement'}), 500
     except Exception as e:
         logging.error(f"Error in play_instant: {e}")
-        set_announcement_playing(False)
+        release_announcement_lock()
         return jsonify({'error': str(e)}), 500
 
 
@@ -376,59 +1008,131 @@ def play_instant():
 def play_yiddish():
     """
     Play the pre-existing Yiddish announcement.
-    Checks if an announcement is already playing and plays the Yiddish file from disk.
+    Checks if an announcement is already playing and plays the Yiddish recording, from memory
+    when it was preloaded at startup.
     """
-    if is_announcement_playing():
+    if not try_acquire_announcement_lock():
         logging.info("Yiddish announcement request ignored - another announcement is playing")
         return jsonify({'error': 'Another announcement is currently playing'}), 429
-    set_announcement_playing(True)
     try:
-        yiddish_path = "/home/tech/yiddish.mp3"  # Path to the Yiddish announcement file
-        if not os.path.exists(yiddish_path):
-            set_announcement_playing(False)
+        if yiddish_clip is None and not os.path.exists(YIDDISH_FILE):
+            release_announcement_lock()
             return jsonify({'error': 'Yiddish announcement file not found'}), 404
-        if play_sound(yiddish_path, "mp3"):
+        if play_sound(YIDDISH_FILE, "mp3", yiddish_clip):
             return jsonify({'success': True, 'message': 'Yiddish announcement played successfully'}), 200
         else:
-            set_announcement_playing(False)
+            release_announcement_lock()
             return jsonify({'error': 'Failed to play Yiddish announcement'}), 500
     except Exception as e:
         logging.error(f"Error in play_yiddish: {e}")
-        set_announcement_playing(False)
+        release_announcement_lock()
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/announcement_status')
-def announcement_status():
+def get_announcement_state():
     """
     Return the current announcement status including whether an announcement is playing,
     the remaining cooldown time, and if the lock file exists.
     """
-    global last_announcement_time
     current_time = time.time()
     time_since_last = current_time - last_announcement_time
     cooldown_active = time_since_last < ANNOUNCEMENT_COOLDOWN
     any_playing = is_announcement_playing()
-    return jsonify({
+    return {
         'is_playing': cooldown_active or any_playing,
         'seconds_remaining': max(0, ANNOUNCEMENT_COOLDOWN - time_since_last) if cooldown_active else 0,
         'lock_file_exists': any_playing
-    })
+    }
+
+
+@app.route('/announcement_status')
+def announcement_status():
+    """
+    Return the current announcement status as JSON.
+    """
+    response = jsonify(get_announcement_state())
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+def announcement_status_events():
+    """
+    Yield Server-Sent Events carrying the announcement status whenever it changes.
+    Waits on status_changed, which is notified for playback in this service and, when the lock file
+    watcher is running, for the button service's. It rechecks once a second so the cooldown countdown
+    and an unwatched lock file are still picked up.
+    Ends after STATUS_STREAM_MAX_AGE so the server thread is handed back; EventSource reconnects.
+    """
+    last_key = None
+    last_sent = time.monotonic()
+    deadline = last_sent + STATUS_STREAM_MAX_AGE
+    yield "retry: 1000\n\n"
+    while time.monotonic() < deadline:
+        state = get_announcement_state()
+        key = (state['is_playing'], math.ceil(state['seconds_remaining']), state['lock_file_exists'])
+        now = time.monotonic()
+        if key != last_key:
+            last_key = key
+            last_sent = now
+            yield f"data: {json.dumps(state)}\n\n"
+        elif now - last_sent >= STATUS_STREAM_KEEPALIVE:
+            last_sent = now
+            yield ": keepalive\n\n"
+        with status_changed:
+            status_changed.wait(timeout=1.0)
+
+
+@app.route('/announcement_status_stream')
+def announcement_status_stream():
+    """
+    Stream announcement status changes to the browser so it does not need to poll.
+    Each open stream holds a server thread, so at most STATUS_STREAM_LIMIT are served at once;
+    further clients get a 503 and fall back to polling /announcement_status.
+    """
+    if not status_stream_slots.acquire(blocking=False):
+        return Response("Too many status streams", status=503, mimetype='text/plain', headers={'Retry-After': '60'})
+    response = Response(
+        announcement_status_events(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    response.call_on_close(status_stream_slots.release)
+    return response
+
+
+def tail_lines(f, count: int) -> bytes:
+    """
+    Return the last count lines of a binary file, reading whole blocks backwards from the end
+    until enough newlines have been seen.
+    """
+    end = os.fstat(f.fileno()).st_size
+    blocks = []
+    newlines = 0
+    while end > 0 and newlines <= count:
+        size = min(LOG_READ_BLOCK, end)
+        end -= size
+        f.seek(end)
+        block = f.read(size)
+        blocks.append(block)
+        newlines += block.count(b'\n')
+    data = b''.join(reversed(blocks))
+    return b''.join(data.splitlines(keepends=True)[-count:])
 
 
 @app.route('/logs')
 def get_logs():
     """
-    Return the last 1000 lines of the log file to limit file size.
+    Return the last LOG_TAIL_LINES lines of the log file to limit file size.
+    The file is read backwards only as far as needed, so the cost does not grow with the log.
     """
     try:
         log_file = "announcement_script.log"
-        if not os.path.exists(log_file):
+        try:
+            f = open(log_file, 'rb')
+        except FileNotFoundError:
             return "No logs found", 404
-        with open(log_file, 'r') as f:
-            lines = f.readlines()
-            last_lines = lines[-1000:] if len(lines) > 1000 else lines
-        return ''.join(last_lines)
+        with f:
+            return Response(tail_lines(f, LOG_TAIL_LINES).decode(errors='replace'), mimetype='text/plain')
     except Exception as e:
         logging.error(f"Error reading logs: {e}")
         return str(e), 500
@@ -444,7 +1148,7 @@ def download_logs():
         if not os.path.exists(log_file):
             flash('Log file not found', 'error')
             return redirect(url_for('index'))
-        return send_file(log_file, as_attachment=True)
+        return send_file(log_file, as_attachment=True, conditional=True, download_name="announcement_script.log")
     except Exception as e:
         logging.error(f"Error downloading logs: {e}")
         flash(f'Error downloading logs: {str(e)}', 'error')
@@ -454,14 +1158,14 @@ def download_logs():
 @app.route('/restart_service', methods=['POST'])
 def restart_service():
     """
-    Restart the announcement service. This endpoint regenerates announcements and simulates a service restart.
+    Restart the announcement service. This endpoint clears the announcement lock and queues
+    regeneration of the announcements, returning without waiting for it.
     """
     try:
         logging.info("Service restart requested")
-        set_announcement_playing(False)
-        threading.Thread(target=pre_generate_all_announcements).start()
-        time.sleep(2)
-        return jsonify({'success': True, 'message': 'Service restarted successfully'}), 200
+        release_announcement_lock()
+        request_pre_generation()
+        return jsonify({'success': True, 'message': 'Service restart queued'}), 202
     except Exception as e:
         logging.error(f"Error restarting service: {e}")
         return jsonify({'error': str(e)}), 500
@@ -473,14 +1177,9 @@ def check_dependencies():
     Check if required dependencies (mpg123 and edge_tts) are installed.
     """
     dependencies = {
-        'mpg123': False,
+        'mpg123': MPG123 is not None,
         'edge_tts': True  # Assumed to be installed since imported
     }
-    try:
-        result = subprocess.run(['which', 'mpg123'], capture_output=True)
-        dependencies['mpg123'] = result.returncode == 0
-    except Exception:
-        pass
     return jsonify(dependencies)
 
 
@@ -489,7 +1188,7 @@ def reset_locks():
     """
     Emergency endpoint to reset all announcement locks.
     """
-    set_announcement_playing(False)
+    release_announcement_lock()
     logging.warning("Manual lock reset performed via web interface")
     return jsonify({'success': True}), 200
 
@@ -500,18 +1199,15 @@ def cache_status():
     Provide information about the TTS cache including file count and total size.
     """
     try:
-        cache_files = os.listdir(CACHE_DIR) if os.path.exists(CACHE_DIR) else []
-        total_size = 0
-        for file in cache_files:
-            file_path = os.path.join(CACHE_DIR, file)
-            if os.path.isfile(file_path):
-                total_size += os.path.getsize(file_path)
-        return jsonify({
-            'cache_count': len(cache_files),
+        cache_count, total_size = get_cache_stats()
+        response = jsonify({
+            'cache_count': cache_count,
             'cache_size_bytes': total_size,
             'cache_size_mb': round(total_size / (1024 * 1024), 2),
             'cache_location': CACHE_DIR
         })
+        response.headers['Cache-Control'] = 'no-store'
+        return response
     except Exception as e:
         logging.error(f"Error getting cache status: {e}")
         return jsonify({'error': str(e)}), 500
@@ -523,12 +1219,24 @@ def clear_cache():
     Clear the TTS cache and regenerate announcements.
     """
     try:
-        if os.path.exists(CACHE_DIR):
-            for file in os.listdir(CACHE_DIR):
-                file_path = os.path.join(CACHE_DIR, file)
-                if os.path.isfile(file_path):
-                    os.remove(file_path)
-        threading.Thread(target=pre_generate_all_announcements).start()
+        try:
+            dir_fd = os.open(CACHE_DIR, os.O_RDONLY | os.O_DIRECTORY)
+        except FileNotFoundError:
+            dir_fd = None
+        if dir_fd is not None:
+            try:
+                # Unlink by name relative to the open directory so each delete skips the path walk
+                with os.scandir(dir_fd) as it:
+                    for entry in it:
+                        if entry.is_file(follow_symlinks=False):
+                            try:
+                                os.unlink(entry.name, dir_fd=dir_fd)
+                            except FileNotFoundError:
+                                pass
+            finally:
+                os.close(dir_fd)
+        invalidate_cache_stats()
+        request_pre_generation()
         return jsonify({'success': True, 'message': 'Cache cleared successfully. Regenerating announcements.'}), 200
     except Exception as e:
         logging.error(f"Error clearing cache: {e}")
@@ -557,14 +1265,27 @@ def cleanup():
     """
     Clean up resources on exit by removing the announcement lock.
     """
-    set_announcement_playing(False)
+    release_announcement_lock()
 
 
 atexit.register(cleanup)
 
-if __name__ == '__main__':
-    set_announcement_playing(False)
+def startup():
+    """
+    Clear stale locks and start preparing cached audio in the background.
+    Called from __main__ for the development server and from gunicorn_conf.py in production, where it
+    runs before the worker heartbeats, so the network and decode work must not block it.
+    """
+    log_listener.start()
+    atexit.register(log_listener.stop)
+    release_announcement_lock()
+    start_lock_file_watcher()
     os.makedirs('static', exist_ok=True)
     os.makedirs('templates', exist_ok=True)
-    pre_generate_all_announcements()
+    request_pre_generation()
+    threading.Thread(target=load_yiddish_clip, name="yiddish-decode", daemon=True).start()
+
+
+if __name__ == '__main__':
+    startup()
     app.run(host='0.0.0.0', port=5000)
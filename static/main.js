@@ -3,14 +3,14 @@ Written by Seth Morrow
 
 This JavaScript file manages the client-side behavior for the Go-Kart Announcement System UI.
 It handles test button events, including a new event for playing the Yiddish announcement.
-It also periodically checks the status of announcements.
+It also follows the status of announcements, streamed from the server when the browser supports it.
 */
 
 document.addEventListener('DOMContentLoaded', function() {
     // Initialize configuration page
     initConfigPage();
-    // Periodically check announcement status every second
-    setInterval(checkAnnouncementStatus, 1000);
+    // Follow announcement status changes
+    watchAnnouncementStatus();
 });
 
 function initConfigPage() {
@@ -125,36 +125,56 @@ function testAnnouncement(text, buttonName) {
     });
 }
 
+function watchAnnouncementStatus() {
+    // Fall back to polling every second if Server-Sent Events are not available
+    if (!window.EventSource) {
+        setInterval(checkAnnouncementStatus, 1000);
+        return;
+    }
+    const source = new EventSource('/announcement_status_stream');
+    source.onmessage = function(event) {
+        applyAnnouncementStatus(JSON.parse(event.data));
+    };
+    // The server refuses streams once too many are open; poll instead when that happens
+    source.onerror = function() {
+        if (source.readyState === EventSource.CLOSED) {
+            setInterval(checkAnnouncementStatus, 1000);
+        }
+    };
+}
+
 function checkAnnouncementStatus() {
     fetch('/announcement_status')
     .then(response => response.json())
-    .then(data => {
-        const testButtons = document.querySelectorAll('.test-buttons button');
-        if (data.is_playing) {
-            testButtons.forEach(btn => btn.disabled = true);
-            const statusMessage = document.getElementById('test-status');
-            if (statusMessage && !statusMessage.textContent) {
-                if (data.seconds_remaining > 0) {
-                    statusMessage.textContent = `Please wait ${Math.ceil(data.seconds_remaining)} seconds before playing another announcement...`;
-                } else {
-                    statusMessage.textContent = 'An announcement is currently playing...';
-                }
-                statusMessage.className = 'status-message';
-            }
-        } else {
-            testButtons.forEach(btn => btn.disabled = false);
-            const statusMessage = document.getElementById('test-status');
-            if (statusMessage && (statusMessage.textContent.includes('Please wait') || statusMessage.textContent.includes('announcement is currently playing'))) {
-                statusMessage.textContent = '';
-                statusMessage.className = 'status-message';
-            }
-        }
-    })
+    .then(applyAnnouncementStatus)
     .catch(error => {
         console.error('Error checking announcement status:', error);
     });
 }
 
+function applyAnnouncementStatus(data) {
+    const testButtons = document.querySelectorAll('.test-buttons button');
+    if (data.is_playing) {
+        testButtons.forEach(btn => btn.disabled = true);
+        const statusMessage = document.getElementById('test-status');
+        if (statusMessage && !statusMessage.textContent) {
+            if (data.seconds_remaining > 0) {
+                statusMessage.textContent = `Please wait ${Math.ceil(data.seconds_remaining)} seconds before playing another announcement...`;
+            } else {
+                statusMessage.textContent = 'An announcement is currently playing...';
+            }
+            statusMessage.className = 'status-message';
+        }
+    } else {
+        testButtons.forEach(btn => btn.disabled = false);
+        const statusMessage = document.getElementById('test-status');
+        if (statusMessage && (statusMessage.textContent.includes('Please wait') || statusMessage.textContent.includes('announcement is currently playing'))) {
+            statusMessage.textContent = '';
+            statusMessage.className = 'status-message';
+        }
+    }
+}
+
 function setupFormValidation() {
     const form = document.getElementById('configForm');
     if (form) {